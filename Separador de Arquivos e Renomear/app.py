@@ -4,18 +4,127 @@
 # Logs são gerados para rastrear o progresso e possíveis erros durante o processamento.
 
 # Importação das bibliotecas necessárias
-import pandas as pd  # Para manipulação de planilhas Excel
-from PyPDF2 import PdfReader, PdfWriter  # Para manipulação de arquivos PDF
+import pikepdf  # Para manipulação de arquivos PDF
 import tkinter as tk  # Para interface gráfica
 from tkinter import filedialog, messagebox, ttk  # Componentes da interface
+import io  # Para montar o PDF em memória antes de gravar
 import os  # Para operações com arquivos e diretórios
+import shutil  # Para cópia direta de arquivos e localização de executáveis
+import sys  # Para detecção de plataforma
+import subprocess  # Para o backend opcional via qpdf
+import tempfile  # Para a área de preparação em RAM
 from typing import Optional  # Para tipagem estática
-import re  # Para expressões regulares
 import logging
+import functools  # Para cachear a leitura da planilha
+import threading  # Para rodar a divisão fora da thread da interface
+import queue  # Para comunicar progresso entre threads
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Para gravação paralela dos blocos
 
 # Configuração de logs
 logging.basicConfig(filename="app.log", level=logging.INFO, format="%(asctime)s - %(message)s")
 
+# Tabela de remoção dos caracteres inválidos em nomes de arquivo
+_TBL = str.maketrans('', '', '<>:"/\\|?*')
+
+# Executável do qpdf, se instalado; quando presente, a divisão roda
+# inteiramente no código nativo do qpdf
+_QPDF_BIN = shutil.which("qpdf")
+
+@functools.lru_cache(maxsize=8)
+def _load_names(excel_path: str, mtime: float) -> list:
+    """
+    Lê a primeira coluna da planilha e devolve os nomes já sanitizados.
+
+    O cache é chaveado por (caminho, mtime): reexecuções com a mesma
+    planilha não a reparseiam. Células vazias viram '' para que a
+    validação possa apontá-las.
+
+    Itera as células direto com o openpyxl em modo read_only, sem montar
+    um DataFrame intermediário; o pandas fica como alternativa.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        return _load_names_pandas(excel_path)
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        linhas = wb.active.iter_rows(min_col=1, max_col=1, values_only=True)
+        next(linhas, None)  # pula a linha de cabeçalho, como o pandas fazia
+        nomes = ['' if v is None else str(v).translate(_TBL).strip()
+                 for (v,) in linhas]
+    finally:
+        wb.close()
+    # O modo read_only pode incluir linhas vazias ao final da dimensão declarada
+    while nomes and not nomes[-1]:
+        nomes.pop()
+    return nomes
+
+def _load_names_pandas(excel_path: str) -> list:
+    """Leitura da primeira coluna via pandas, quando o openpyxl não está disponível"""
+    # Import tardio: o pandas arrasta NumPy/dateutil e atrasaria a abertura
+    # da janela, sendo que este caminho raramente é usado
+    import pandas as pd
+    try:
+        df = pd.read_excel(excel_path, engine="calamine", usecols=[0], header=0, dtype="string")
+    except ImportError:
+        df = pd.read_excel(excel_path, engine="openpyxl", usecols=[0], header=0, dtype="string")
+    return ['' if pd.isna(v) else str(v).translate(_TBL).strip()
+            for v in df.iloc[:, 0].tolist()]
+
+def _copiar_pdf_inteiro(pdf_path: str, out_path: str) -> None:
+    """
+    Copia o PDF de origem direto para o destino, byte a byte.
+
+    Usado quando um único bloco cobre o documento inteiro: reprocessar as
+    páginas seria um 'cp' muito lento. Com os.sendfile a cópia acontece
+    dentro do kernel, sem rotear os bytes pelo espaço do usuário. Só no
+    Linux: no macOS/BSD o sendfile exige que o destino seja um socket.
+    """
+    if sys.platform == "linux":
+        with open(pdf_path, 'rb') as src, open(out_path, 'wb') as dst:
+            restante = os.fstat(src.fileno()).st_size
+            offset = 0
+            while restante > 0:
+                enviado = os.sendfile(dst.fileno(), src.fileno(), offset, restante)
+                if enviado == 0:
+                    break
+                offset += enviado
+                restante -= enviado
+    else:
+        shutil.copyfile(pdf_path, out_path)
+
+def _write_chunk(pdf_path: str, start: int, end: int, out_path: str) -> None:
+    """
+    Grava o bloco de páginas [start, end) do PDF de origem em out_path.
+
+    Função de módulo (e não método) para que possa ser enviada a um
+    processo filho; cada worker abre sua própria cópia do PDF, sem
+    compartilhar estado entre processos. Prefere o qpdf nativo quando
+    instalado; caso contrário usa o pikepdf.
+    """
+    if _QPDF_BIN:
+        # qpdf numera páginas a partir de 1 e o intervalo é inclusivo
+        subprocess.run([_QPDF_BIN, "--empty", "--pages", pdf_path,
+                        f"{start + 1}-{end}", "--", out_path], check=True)
+        return
+
+    # Buffer de leitura de 1 MiB para agrupar as muitas leituras pequenas
+    # feitas durante o parse do PDF
+    with open(pdf_path, 'rb', buffering=1 << 20) as pdf_file, pikepdf.Pdf.open(pdf_file) as src:
+        dst = pikepdf.Pdf.new()
+        dst.pages.extend(src.pages[start:end])
+        # Descarta recursos herdados da árvore de páginas que nenhuma
+        # página do bloco referencia
+        dst.remove_unreferenced_resources()
+        # Serializa o PDF em memória e grava o arquivo com uma única
+        # chamada de escrita, em vez de muitas escritas pequenas
+        buffer = io.BytesIO()
+        dst.save(buffer)
+        dst.close()
+        with open(out_path, 'wb') as f:
+            f.write(buffer.getbuffer())
+
 class PDFSplitter:
     """
     Classe responsável pela lógica de divisão do PDF.
@@ -27,23 +136,21 @@ class PDFSplitter:
         """Inicializa o divisor de PDF com flag de cancelamento"""
         self.cancel_operation = False
 
-    def validate_excel_data(self, df: pd.DataFrame) -> bool:
+    def validate_excel_data(self, nomes: list) -> Optional[str]:
         """
         Valida se a planilha Excel tem o formato correto.
-        
+
         Args:
-            df: DataFrame contendo os dados da planilha Excel
-            
+            nomes: Lista de nomes lidos da primeira coluna da planilha
+
         Returns:
-            bool: True se os dados são válidos, False caso contrário
+            Optional[str]: Mensagem de erro, ou None se os dados são válidos
         """
-        if df.empty:
-            messagebox.showerror("Erro", "A planilha está vazia.")
-            return False
-        if df.iloc[:, 0].isnull().any():
-            messagebox.showerror("Erro", "Existem células vazias na primeira coluna da planilha.")
-            return False
-        return True
+        if not nomes:
+            return "A planilha está vazia."
+        if any(not nome for nome in nomes):
+            return "Existem células vazias na primeira coluna da planilha."
+        return None
 
     def sanitize_filename(self, filename: str) -> str:
         """
@@ -56,77 +163,127 @@ class PDFSplitter:
             str: Nome do arquivo sanitizado
         """
         # Remove caracteres inválidos para nome de arquivo
-        sanitized = re.sub(r'[<>:"/\\|?*]', '', filename)
-        return sanitized.strip()
+        return filename.translate(_TBL).strip()
 
-    def dividir_pdf(self, pdf_path: str, excel_path: str, paginas_por_arquivo: int, 
-                    output_folder: str, progress_callback) -> bool:
+    def dividir_pdf(self, pdf_path: str, excel_path: str, paginas_por_arquivo: int,
+                    output_folder: str, progress_callback, error_callback,
+                    use_ram_staging: bool = True) -> bool:
         """
         Divide o PDF em múltiplos arquivos baseado na planilha Excel.
-        
+
+        Este método roda em uma thread de trabalho, então não interage com
+        o Tkinter: erros são reportados via error_callback, que entrega a
+        mensagem à thread da interface.
+
         Args:
             pdf_path: Caminho do arquivo PDF
             excel_path: Caminho da planilha Excel
             paginas_por_arquivo: Número de páginas por arquivo
             output_folder: Pasta de destino
             progress_callback: Função para atualizar o progresso
-        
+            error_callback: Função que recebe mensagens de erro
+            use_ram_staging: Se True, grava os blocos primeiro em RAM
+                (/dev/shm, quando existir) e depois os move para o destino
+
         Returns:
             bool: True se a operação foi bem sucedida, False caso contrário
         """
         try:
-            # Carrega a planilha Excel
-            df = pd.read_excel(excel_path)
-            if not self.validate_excel_data(df):
+            # Carrega os nomes da planilha (cacheado por caminho + mtime, então
+            # reexecuções com a mesma planilha não a reparseiam)
+            nomes = _load_names(excel_path, os.path.getmtime(excel_path))
+            erro = self.validate_excel_data(nomes)
+            if erro:
+                error_callback(erro)
                 return False
 
-            # Abre o arquivo PDF
-            with open(pdf_path, 'rb') as pdf_file:
-                reader = PdfReader(pdf_file)
-                total_paginas = len(reader.pages)
-                
-                # Calcula o número total de arquivos que serão gerados
-                total_steps = (total_paginas // paginas_por_arquivo) + (1 if total_paginas % paginas_por_arquivo != 0 else 0)
-                
-                # Verifica se há nomes suficientes na planilha
-                if total_steps > len(df):
-                    messagebox.showerror("Erro", 
-                        f"A planilha contém menos nomes ({len(df)}) do que o número de arquivos que serão gerados ({total_steps}).")
+            # Abre o arquivo PDF apenas para contar as páginas; a leitura
+            # pesada acontece nos processos de gravação
+            with pikepdf.Pdf.open(pdf_path) as src:
+                total_paginas = len(src.pages)
+
+            # Calcula o número total de arquivos que serão gerados (teto da divisão)
+            total_steps = -(-total_paginas // paginas_por_arquivo)
+
+            # Verifica se há nomes suficientes na planilha
+            if total_steps > len(nomes):
+                error_callback(
+                    f"A planilha contém menos nomes ({len(nomes)}) do que o número de arquivos que serão gerados ({total_steps}).")
+                return False
+
+            # Caso-limite: um único bloco cobre o PDF inteiro — copia o arquivo
+            # direto com o novo nome, sem reprocessar as páginas
+            if total_steps == 1:
+                novo_nome = nomes[0] + ".pdf"
+                try:
+                    _copiar_pdf_inteiro(pdf_path, os.path.join(output_folder, novo_nome))
+                    logging.info(f"Arquivo {novo_nome} criado com sucesso.")
+                except Exception as e:
+                    logging.error(f"Erro ao salvar arquivo {novo_nome}: {e}")
+                    error_callback(f"Erro ao salvar arquivo {novo_nome}: {str(e)}")
                     return False
-                
-                # Processa cada bloco de páginas
-                for i in range(0, total_paginas, paginas_por_arquivo):
-                    if self.cancel_operation:
-                        logging.info("Operação cancelada pelo usuário.")
-                        return False
-
-                    # Cria um novo PDF para o bloco atual
-                    writer = PdfWriter()
-                    for j in range(i, min(i + paginas_por_arquivo, total_paginas)):
-                        writer.add_page(reader.pages[j])
-                    
-                    # Gera o nome do arquivo e salva
-                    novo_nome = self.sanitize_filename(str(df.iloc[i // paginas_por_arquivo, 0])) + ".pdf"
-                    output_path = os.path.join(output_folder, novo_nome)
-                    
-                    try:
-                        with open(output_path, 'wb') as novo_pdf:
-                            writer.write(novo_pdf)
-                        logging.info(f"Arquivo {novo_nome} criado com sucesso.")
-                    except Exception as e:
-                        logging.error(f"Erro ao salvar arquivo {novo_nome}: {e}")
-                        messagebox.showerror("Erro", f"Erro ao salvar arquivo {novo_nome}: {str(e)}")
-                        return False
-                    
-                    # Atualiza o progresso
-                    progress = ((i // paginas_por_arquivo + 1) / total_steps * 100)
-                    progress_callback(progress)
-                    
+                progress_callback(100)
+                logging.info("Processo concluído com sucesso.")
+                return True
+
+            # Em trabalhos com muitos arquivos pequenos, o custo de metadados do
+            # sistema de arquivos de destino domina; grava os blocos primeiro em
+            # RAM e move para o destino conforme eles terminam
+            staging_dir = None
+            if use_ram_staging and os.path.isdir("/dev/shm"):
+                staging_dir = tempfile.mkdtemp(prefix="separador_pdf_", dir="/dev/shm")
+            destino = staging_dir or output_folder
+
+            try:
+                # Monta o plano de blocos como listas paralelas (início, fim,
+                # caminho de saída): todo o trabalho fica conhecido antes de
+                # gravar e pode ser despachado de uma vez
+                starts = list(range(0, total_paginas, paginas_por_arquivo))
+                ends = [min(s + paginas_por_arquivo, total_paginas) for s in starts]
+                out_paths = [os.path.join(destino, nomes[k] + ".pdf") for k in range(total_steps)]
+
+                # Cada bloco é independente: grava todos em paralelo, um worker por núcleo
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    futures = {executor.submit(_write_chunk, pdf_path, start, end, out_path): out_path
+                               for start, end, out_path in zip(starts, ends, out_paths)}
+                    concluidos = 0
+                    ultimo_emitido = 0.0
+                    for future in as_completed(futures):
+                        if self.cancel_operation:
+                            executor.shutdown(cancel_futures=True)
+                            logging.info("Operação cancelada pelo usuário.")
+                            return False
+
+                        novo_nome = os.path.basename(futures[future])
+                        try:
+                            future.result()
+                            if staging_dir:
+                                shutil.move(futures[future], os.path.join(output_folder, novo_nome))
+                            logging.info(f"Arquivo {novo_nome} criado com sucesso.")
+                        except Exception as e:
+                            logging.error(f"Erro ao salvar arquivo {novo_nome}: {e}")
+                            error_callback(f"Erro ao salvar arquivo {novo_nome}: {str(e)}")
+                            executor.shutdown(cancel_futures=True)
+                            return False
+
+                        # Atualiza o progresso conforme os blocos terminam, mas no
+                        # máximo a cada 1% (redesenhar a barra por arquivo domina o
+                        # tempo em trabalhos com milhares de saídas); o 100% final
+                        # é sempre emitido
+                        concluidos += 1
+                        progress = concluidos / total_steps * 100
+                        if progress - ultimo_emitido >= 1.0 or concluidos == total_steps:
+                            progress_callback(progress)
+                            ultimo_emitido = progress
+            finally:
+                if staging_dir:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+
             logging.info("Processo concluído com sucesso.")
             return True
         except Exception as e:
             logging.error(f"Erro durante o processamento: {e}")
-            messagebox.showerror("Erro", f"Erro durante o processamento: {str(e)}")
+            error_callback(f"Erro durante o processamento: {str(e)}")
             return False
 
 class Application:
@@ -186,8 +343,9 @@ class Application:
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=5, column=0, columnspan=3, pady=20)
 
-        # Botões de ação
-        ttk.Button(button_frame, text="Iniciar", command=self.iniciar_divisao).pack(side=tk.LEFT, padx=5)
+        # Botões de ação (o de Iniciar fica desabilitado durante uma divisão)
+        self.botao_iniciar = ttk.Button(button_frame, text="Iniciar", command=self.iniciar_divisao)
+        self.botao_iniciar.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancelar", command=self.cancelar_operacao).pack(side=tk.LEFT, padx=5)
 
         self.centralizar_janela()
@@ -228,16 +386,6 @@ class Application:
         """Abre diálogo para selecionar pasta de saída"""
         self.output_folder.set(filedialog.askdirectory())
     
-    def update_progress(self, value):
-        """
-        Atualiza a barra de progresso.
-        
-        Args:
-            value: Valor do progresso (0-100)
-        """
-        self.progress_var.set(value)
-        self.root.update_idletasks()
-    
     def cancelar_operacao(self):
         """Cancela a operação em andamento"""
         self.pdf_splitter.cancel_operation = True
@@ -260,23 +408,56 @@ class Application:
         return True
     
     def iniciar_divisao(self):
-        """Inicia o processo de divisão do PDF"""
+        """
+        Inicia o processo de divisão do PDF.
+        A divisão roda em uma thread separada para que o mainloop do Tk
+        continue processando eventos (barra de progresso, botão Cancelar).
+        O botão Iniciar fica desabilitado até a divisão terminar, para que
+        um segundo clique não dispare uma divisão concorrente.
+        """
         if not self.validar_campos():
             return
-        
+
+        self.botao_iniciar.state(["disabled"])
         self.pdf_splitter.cancel_operation = False
+        self.fila_progresso = queue.Queue()
+        threading.Thread(target=self._executar_divisao, daemon=True).start()
+        self.root.after(50, self._drenar_fila)
+
+    def _executar_divisao(self):
+        """Executa a divisão na thread de trabalho e publica o resultado na fila"""
         success = self.pdf_splitter.dividir_pdf(
             self.pdf_path.get(),
             self.excel_path.get(),
             int(self.paginas_por_arquivo.get()),
             self.output_folder.get(),
-            self.update_progress
+            lambda valor: self.fila_progresso.put(("progress", valor)),
+            lambda msg: self.fila_progresso.put(("error", msg))
         )
-        
-        if success:
-            messagebox.showinfo("Concluído", "Processo concluído com sucesso!")
-        elif not self.pdf_splitter.cancel_operation:
-            messagebox.showerror("Erro", "Ocorreu um erro durante o processamento.")
+        self.fila_progresso.put(("done", success))
+
+    def _drenar_fila(self):
+        """
+        Consome as mensagens pendentes da fila de progresso na thread do Tk.
+        Reagenda a si mesma até receber a mensagem de conclusão.
+        """
+        while True:
+            try:
+                tipo, valor = self.fila_progresso.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == "progress":
+                self.progress_var.set(valor)
+            elif tipo == "error":
+                messagebox.showerror("Erro", valor)
+            elif tipo == "done":
+                self.botao_iniciar.state(["!disabled"])
+                if valor:
+                    messagebox.showinfo("Concluído", "Processo concluído com sucesso!")
+                elif not self.pdf_splitter.cancel_operation:
+                    messagebox.showerror("Erro", "Ocorreu um erro durante o processamento.")
+                return
+        self.root.after(50, self._drenar_fila)
     
     def centralizar_janela(self):
         """Centraliza a janela principal na tela"""